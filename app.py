@@ -1,57 +1,255 @@
+import hashlib
+import os
+import types
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import pyarrow as pa
+import pyarrow.feather as feather
+import plotly.express as px
 
 st.set_page_config(page_title="Hotel Bookings Dashboard", layout="wide")
 
 # ---- LOAD DATA ----
-@st.cache_data
-def load_data():
-    df = pd.read_csv("Hotelbookings.csv")
+CSV_PATH = "Hotelbookings.csv"
+DATA_PATH = "Hotelbookings.feather"
+# Only the columns the dashboard reads
+USECOLS = [
+    "hotel", "arrival_date_year", "arrival_date_month", "customer_type", "adr", "country", "agent",
+    "children", "babies", "stays_in_week_nights", "stays_in_weekend_nights", "is_canceled", "lead_time",
+    "is_repeated_guest", "assigned_room_type", "reserved_room_type", "market_segment", "distribution_channel",
+    "total_of_special_requests", "required_car_parking_spaces", "reservation_status",
+]
+MONTH_ORDER = ['January','February','March','April','May','June','July','August','September','October','November','December']
+
+def prepare_data(df):
     # Clean missing values for key columns
     df['children'] = df['children'].fillna(0)
     df['country'] = df['country'].fillna('Unknown')
     df['agent'] = df['agent'].fillna(-1)
-    df['company'] = df['company'].fillna(-1)
+    # Downcast numeric columns to the narrowest dtype that holds their values
+    for c, t in [("is_canceled", "int8"), ("is_repeated_guest", "int8"), ("required_car_parking_spaces", "int8"),
+                 ("total_of_special_requests", "int8"), ("babies", "int8"), ("children", "int8"),
+                 ("stays_in_week_nights", "int16"), ("stays_in_weekend_nights", "int16"),
+                 ("arrival_date_year", "int16"), ("lead_time", "int16"), ("adr", "float32")]:
+        df[c] = df[c].astype(t)
+    # Filter columns as categoricals so membership tests run on small integer codes
+    for c in ["hotel", "customer_type"]:
+        df[c] = df[c].astype("category")
+    # Group-by keys as categoricals so groupby/value_counts hash integer codes instead of strings
+    for c in ["country", "market_segment"]:
+        df[c] = df[c].astype("category")
+    # Remaining string columns as Arrow strings: contiguous UTF-8 buffers with vectorized compare kernels
+    for c in ["distribution_channel", "reservation_status"]:
+        df[c] = df[c].astype("string[pyarrow]")
+    # Room types share one category list so assigned vs reserved compares int8 codes
+    room_types = sorted(set(df["reserved_room_type"].unique()) | set(df["assigned_room_type"].unique()))
+    for c in ["reserved_room_type", "assigned_room_type"]:
+        df[c] = pd.Categorical(df[c], categories=room_types)
+    # Calendar-ordered months: monthly groupbys come out in order without a reindex
+    df["arrival_date_month"] = pd.Categorical(df["arrival_date_month"], categories=MONTH_ORDER, ordered=True)
     return df
 
-df = load_data()
+def csv_fingerprint():
+    # Size plus SHA-256 of the CSV; stored in the Feather schema metadata to notice a replaced CSV
+    digest = hashlib.sha256()
+    with open(CSV_PATH, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return f"{os.path.getsize(CSV_PATH)}:{digest.hexdigest()}".encode()
+
+def convert_data():
+    # The cleaned, typed frame is stored as Feather (shipped in the repo), so loads read Arrow buffers with
+    # no CSV parsing or cleanup. It is rebuilt whenever the CSV no longer matches the fingerprint it was built from.
+    if not os.path.exists(CSV_PATH):
+        return
+    fingerprint = csv_fingerprint()
+    if os.path.exists(DATA_PATH):
+        with pa.memory_map(DATA_PATH) as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+        if metadata.get(b"csv_fingerprint") == fingerprint:
+            return
+    table = pa.Table.from_pandas(prepare_data(pd.read_csv(CSV_PATH, engine="pyarrow", usecols=USECOLS)), preserve_index=False)
+    table = table.replace_schema_metadata({**table.schema.metadata, b"csv_fingerprint": fingerprint})
+    feather.write_feather(table, DATA_PATH)
+
+@st.cache_data
+def load_data():
+    # Checked once per cache lifetime rather than hashing the CSV on every rerun
+    convert_data()
+    # pandas 2.x reads Arrow string columns back as string[python], so reapply the pyarrow storage
+    return pd.read_feather(DATA_PATH).astype(
+        {"distribution_channel": "string[pyarrow]", "reservation_status": "string[pyarrow]"}
+    )
+
+@st.cache_data
+def sidebar_options():
+    # Built once from the cached frame instead of calling .unique() on every rerun
+    df = load_data()
+    return {
+        "hotels": df["hotel"].cat.categories.tolist(),
+        "years": sorted(df["arrival_date_year"].unique().tolist()),
+        "months": df["arrival_date_month"].cat.categories.tolist(),
+        "customer_types": df["customer_type"].cat.categories.tolist(),
+        "adr_min": int(df["adr"].min()),
+        "adr_max": int(df["adr"].max()),
+    }
+
+@st.cache_data
+def filter_stats():
+    # Row counts per category code (per year offset for years) and the sorted ADR column,
+    # so each predicate's selectivity can be estimated without scanning the rows
+    df = load_data()
+    counts = {c: np.bincount(df[c].cat.codes, minlength=len(df[c].cat.categories))
+              for c in ["hotel", "arrival_date_month", "customer_type"]}
+    year = df["arrival_date_year"].to_numpy()
+    counts["arrival_date_year"] = np.bincount(year - year.min())
+    return counts, np.sort(df["adr"].to_numpy())
+
+@st.cache_data(max_entries=32)
+def get_filtered(hotels: tuple, years: tuple, months: tuple, customer_types: tuple, adr_lo: int, adr_hi: int) -> pd.DataFrame:
+    df = load_data()
+    counts, adr_sorted = filter_stats()
+    # (rows kept, column values, row test) per predicate; code predicates test through a boolean lookup table
+    predicates = []
+    for col, selection in [("hotel", hotels), ("arrival_date_month", months), ("customer_type", customer_types)]:
+        lut = df[col].cat.categories.isin(selection)
+        predicates.append((counts[col][lut].sum(), df[col].cat.codes.to_numpy(), lut.__getitem__))
+    year = df["arrival_date_year"].to_numpy()
+    first_year = year.min()
+    year_lut = np.isin(np.arange(first_year, first_year + len(counts["arrival_date_year"])), years)
+    predicates.append((counts["arrival_date_year"][year_lut].sum(), year, lambda v: year_lut[v - first_year]))
+    adr_kept = np.searchsorted(adr_sorted, adr_hi, side="right") - np.searchsorted(adr_sorted, adr_lo, side="left")
+    predicates.append((adr_kept, df["adr"].to_numpy(), lambda v: (v >= adr_lo) & (v <= adr_hi)))
+    # Most selective predicate first over all rows, each later one only over the surviving rows;
+    # predicates that keep every row are skipped
+    rows = None
+    for kept, values, test in sorted(predicates, key=lambda p: p[0]):
+        if kept == len(df):
+            continue
+        rows = np.flatnonzero(test(values)) if rows is None else rows[test(values[rows])]
+    if rows is not None:
+        df = df.iloc[rows]
+    # eval hands the expression to numexpr, which computes it in one pass without temporaries;
+    # revenue is widened to float64 so the totals summed from it stay exact to the unit
+    return df.eval("revenue = adr * (stays_in_week_nights + stays_in_weekend_nights)").astype({"revenue": "float64"})
+
+# ---- CACHED AGGREGATES ----
+# Each helper takes the same filter key as get_filtered, so identical selections skip the group pass
+@st.cache_data(max_entries=32)
+def agg_top_countries(key):
+    # nlargest partially sorts the counts instead of sorting every country; observed=True skips filtered-out categories
+    return get_filtered(*key).groupby('country', observed=True).size().nlargest(10).rename("count")
+
+@st.cache_data(max_entries=32)
+def agg_segment_counts(key):
+    return get_filtered(*key)["market_segment"].value_counts().loc[lambda c: c > 0]
+
+@st.cache_data(max_entries=32)
+def agg_monthly_adr(key):
+    return get_filtered(*key).groupby(['arrival_date_year','arrival_date_month'], observed=True)['adr'].mean().reset_index()
+
+@st.cache_data(max_entries=32)
+def agg_monthly(key):
+    # Cancellation rate and revenue per month from one grouping pass
+    return get_filtered(*key).groupby('arrival_date_month', observed=False).agg(
+        cancel_rate=('is_canceled', 'mean'), revenue=('revenue', 'sum'),
+    )
+
+@st.cache_data(max_entries=32)
+def agg_revenue_segment(key):
+    return get_filtered(*key).groupby('market_segment', observed=True)["revenue"].sum().sort_values(ascending=False)
+
+@st.cache_data(max_entries=32)
+def agg_top_agents(key):
+    return get_filtered(*key)['agent'].value_counts(sort=False).nlargest(10)
+
+@st.cache_data(max_entries=32)
+def agg_adr_hist(key, bins=30, grid=2048):
+    # Bar counts use every row; the KDE curve smooths a fine-grid histogram with a Gaussian kernel,
+    # which costs O(N + grid) instead of a kernel evaluation per data point
+    adr = get_filtered(*key)["adr"].to_numpy(dtype="float64")
+    counts, edges = np.histogram(adr, bins=bins)
+    if len(adr) < 2 or adr.std(ddof=1) == 0:
+        return edges, counts, np.array([]), np.array([])
+    bw = adr.std(ddof=1) * len(adr) ** -0.2  # Scott's rule, matching scipy's bw_method="scott" that seaborn uses
+    # Extend the grid three bandwidths past the data, like seaborn's cut=3, so the tails aren't clipped
+    fine, fine_edges = np.histogram(adr, bins=grid, range=(adr.min() - 3 * bw, adr.max() + 3 * bw))
+    step = fine_edges[1] - fine_edges[0]
+    half = min(int(4 * bw / step) + 1, (grid - 1) // 2)
+    offsets = np.arange(-half, half + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bw) ** 2)
+    density = np.convolve(fine, kernel / kernel.sum(), mode="same")
+    # Rescale from per-grid-cell to per-bar counts so the curve overlays the bars
+    kde = density * (edges[1] - edges[0]) / step
+    return edges, counts, (fine_edges[:-1] + fine_edges[1:]) / 2, kde
+
+def bin_counts(values, bins):
+    # Bin in numpy so only the bar heights, not every row, are sent to the browser
+    counts, edges = np.histogram(values, bins=bins)
+    return (edges[:-1] + edges[1:]) / 2, counts
+
+options = sidebar_options()
 
 # ---- SIDEBAR FILTERS ----
 st.sidebar.header("Filters")
 hotel_types = st.sidebar.multiselect(
-    "Select Hotel Type", options=df["hotel"].unique(), default=df["hotel"].unique()
+    "Select Hotel Type", options=options["hotels"], default=options["hotels"]
 )
 years = st.sidebar.multiselect(
-    "Select Year", options=sorted(df["arrival_date_year"].unique()), default=sorted(df["arrival_date_year"].unique())
+    "Select Year", options=options["years"], default=options["years"]
 )
 months = st.sidebar.multiselect(
-    "Select Month", options=df["arrival_date_month"].unique(), default=df["arrival_date_month"].unique()
+    "Select Month", options=options["months"], default=options["months"]
 )
 customer_types = st.sidebar.multiselect(
-    "Select Customer Type", options=df["customer_type"].unique(), default=df["customer_type"].unique()
+    "Select Customer Type", options=options["customer_types"], default=options["customer_types"]
 )
-min_adr, max_adr = int(df['adr'].min()), int(df['adr'].max())
+min_adr, max_adr = options["adr_min"], options["adr_max"]
 adr_range = st.sidebar.slider("ADR Range", min_adr, max_adr, (min_adr, max_adr))
 
-# Filter data
-filtered_df = df[
-    (df["hotel"].isin(hotel_types)) &
-    (df["arrival_date_year"].isin(years)) &
-    (df["arrival_date_month"].isin(months)) &
-    (df["customer_type"].isin(customer_types)) &
-    (df["adr"].between(adr_range[0], adr_range[1]))
-]
+# Filter data; sorted tuples make identical selections hit the same cache entry
+filter_key = (
+    tuple(sorted(hotel_types)), tuple(sorted(years)), tuple(sorted(months)), tuple(sorted(customer_types)),
+    adr_range[0], adr_range[1],
+)
+filtered_df = get_filtered(*filter_key)
 
 # ---- TABS ----
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "Overview", "ADR Insights", "Booking & Customer Insights", "Cancellation & Revenue", "Special Requests & Parking"
-])
+# A radio instead of st.tabs: st.tabs runs every tab body on each rerun, this renders only the active one
+TAB_NAMES = ["Overview", "ADR Insights", "Booking & Customer Insights", "Cancellation & Revenue", "Special Requests & Parking"]
+active_tab = st.radio("Section", TAB_NAMES, horizontal=True, key="active_tab", label_visibility="collapsed")
+
+def render_charts(filtered_df, filter_key, charts):
+    for title, caption, build in charts:
+        st.write(f"#### {title}")
+        st.write(caption)
+        st.plotly_chart(cached_figure(title, filter_key, builder_version(build), build, filtered_df))
 
 # ---- TAB 1: OVERVIEW ----
-with tab1:
+def build_hotel_counts(filtered_df, filter_key):
+    hotel_counts = filtered_df.groupby("hotel", observed=True).size().rename("count")
+    return px.bar(hotel_counts.reset_index(), x="hotel", y="count")
+
+def build_year_counts(filtered_df, filter_key):
+    year_counts = filtered_df.groupby(["arrival_date_year", "hotel"], observed=True).size().reset_index(name="count")
+    fig = px.bar(year_counts, x="arrival_date_year", y="count", color="hotel", barmode="group")
+    fig.update_xaxes(type="category")
+    return fig
+
+def build_top_countries(filtered_df, filter_key):
+    top_countries = agg_top_countries(filter_key)
+    fig = px.bar(top_countries.reset_index(), x="count", y="country", orientation="h")
+    fig.update_yaxes(autorange="reversed")
+    return fig
+
+OVERVIEW_CHARTS = [
+    ("Bookings by Hotel Type", "This chart highlights booking volume for each hotel type. Use it to spot trends in demand.", build_hotel_counts),
+    ("Bookings Over Years", "Year-wise bookings help track growth or seasonality patterns.", build_year_counts),
+    ("Top 10 Countries by Booking Volume", "See which source markets are most important for your business.", build_top_countries),
+]
+
+def render_overview(filtered_df, filter_key):
     st.title("Hotel Bookings: Executive Dashboard")
     st.write("""
         This interactive dashboard provides comprehensive insights into hotel bookings. 
@@ -63,189 +261,191 @@ with tab1:
     kpi1, kpi2, kpi3, kpi4 = st.columns(4)
     kpi1.metric("Total Bookings", f"{filtered_df.shape[0]:,}")
     kpi2.metric("Avg. ADR", f"{filtered_df['adr'].mean():.2f}")
-    kpi3.metric("Total Revenue", f"{(filtered_df['adr'] * (filtered_df['stays_in_week_nights'] + filtered_df['stays_in_weekend_nights'])).sum():,.0f}")
+    kpi3.metric("Total Revenue", f"{filtered_df['revenue'].sum():,.0f}")
     kpi4.metric("Cancellation Rate", f"{filtered_df['is_canceled'].mean()*100:.1f}%")
     st.markdown("---")
 
-    st.write("#### Bookings by Hotel Type")
-    st.write("This chart highlights booking volume for each hotel type. Use it to spot trends in demand.")
-    fig, ax = plt.subplots()
-    sns.countplot(data=filtered_df, x="hotel", ax=ax)
-    st.pyplot(fig)
-
-    st.write("#### Bookings Over Years")
-    st.write("Year-wise bookings help track growth or seasonality patterns.")
-    fig, ax = plt.subplots()
-    sns.countplot(data=filtered_df, x="arrival_date_year", hue="hotel", ax=ax)
-    st.pyplot(fig)
-
-    st.write("#### Top 10 Countries by Booking Volume")
-    st.write("See which source markets are most important for your business.")
-    top_countries = filtered_df['country'].value_counts().head(10)
-    fig, ax = plt.subplots()
-    sns.barplot(y=top_countries.index, x=top_countries.values, ax=ax)
-    st.pyplot(fig)
+    render_charts(filtered_df, filter_key, OVERVIEW_CHARTS)
 
 # ---- TAB 2: ADR INSIGHTS ----
-with tab2:
+def build_adr_hist(filtered_df, filter_key):
+    edges, counts, kde_x, kde_y = agg_adr_hist(filter_key)
+    fig = px.bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, labels={"x": "adr", "y": "count"})
+    fig.add_scatter(x=kde_x, y=kde_y, mode="lines", name="KDE", showlegend=False)
+    fig.update_layout(bargap=0)
+    return fig
+
+def sample_per_group(df, col, n=5000):
+    # Quartiles are visually stable well below this size; shuffling then taking the head of each group
+    # caps every box at n points without a per-group apply; sort_index keeps the original category order
+    return df.sample(frac=1, random_state=0).groupby(col, observed=True).head(n).sort_index()
+
+def build_adr_box(col):
+    def build(filtered_df, filter_key):
+        return px.box(sample_per_group(filtered_df[[col, "adr"]], col), x=col, y="adr")
+    return build
+
+def build_monthly_adr(filtered_df, filter_key):
+    monthly_adr = agg_monthly_adr(filter_key)
+    return px.line(
+        monthly_adr.astype({"arrival_date_year": str}), x="arrival_date_month", y="adr", color="arrival_date_year",
+        category_orders={"arrival_date_month": MONTH_ORDER},
+    )
+
+ADR_CHARTS = [
+    ("Distribution of ADR", "This histogram shows how ADR is distributed. Check for pricing clusters or outliers.", build_adr_hist),
+    ("ADR by Hotel Type", "Boxplots reveal how pricing differs between hotel types.", build_adr_box("hotel")),
+    ("ADR Over Time (by Month & Year)", "Identify seasonal patterns in ADR across months/years.", build_monthly_adr),
+    ("ADR by Customer Type", "See how pricing varies for different segments of guests.", build_adr_box("customer_type")),
+    ("ADR by Distribution Channel", "Assess which sales channels yield higher/lower average daily rates.", build_adr_box("distribution_channel")),
+    ("ADR by Reserved Room Type", "Spot pricing differences across room categories.", build_adr_box("reserved_room_type")),
+]
+
+def render_adr_insights(filtered_df, filter_key):
     st.header("ADR (Average Daily Rate) Insights")
 
-    st.write("#### Distribution of ADR")
-    st.write("This histogram shows how ADR is distributed. Check for pricing clusters or outliers.")
-    fig, ax = plt.subplots()
-    sns.histplot(filtered_df["adr"], bins=30, kde=True, ax=ax)
-    st.pyplot(fig)
-
-    st.write("#### ADR by Hotel Type")
-    st.write("Boxplots reveal how pricing differs between hotel types.")
-    fig, ax = plt.subplots()
-    sns.boxplot(data=filtered_df, x="hotel", y="adr", ax=ax)
-    st.pyplot(fig)
-
-    st.write("#### ADR Over Time (by Month & Year)")
-    st.write("Identify seasonal patterns in ADR across months/years.")
-    monthly_adr = filtered_df.groupby(['arrival_date_year','arrival_date_month'])['adr'].mean().reset_index()
-    order = ['January','February','March','April','May','June','July','August','September','October','November','December']
-    fig, ax = plt.subplots(figsize=(10,4))
-    sns.lineplot(data=monthly_adr, x="arrival_date_month", y="adr", hue="arrival_date_year", ax=ax, sort=False)
-    ax.set_xticks(range(len(order)))
-    ax.set_xticklabels(order, rotation=45)
-    st.pyplot(fig)
-
-    st.write("#### ADR by Customer Type")
-    st.write("See how pricing varies for different segments of guests.")
-    fig, ax = plt.subplots()
-    sns.boxplot(data=filtered_df, x="customer_type", y="adr", ax=ax)
-    st.pyplot(fig)
-
-    st.write("#### ADR by Distribution Channel")
-    st.write("Assess which sales channels yield higher/lower average daily rates.")
-    fig, ax = plt.subplots()
-    sns.boxplot(data=filtered_df, x="distribution_channel", y="adr", ax=ax)
-    st.pyplot(fig)
-
-    st.write("#### ADR by Reserved Room Type")
-    st.write("Spot pricing differences across room categories.")
-    fig, ax = plt.subplots()
-    sns.boxplot(data=filtered_df, x="reserved_room_type", y="adr", ax=ax)
-    st.pyplot(fig)
+    render_charts(filtered_df, filter_key, ADR_CHARTS)
 
 # ---- TAB 3: BOOKING & CUSTOMER INSIGHTS ----
-with tab3:
-    st.header("Booking & Customer Insights")
-
-    st.write("#### Lead Time Distribution")
-    st.write("Longer lead times may indicate advanced planning by guests; short lead times can suggest last-minute deals.")
-    fig, ax = plt.subplots()
-    sns.histplot(filtered_df["lead_time"], bins=30, ax=ax)
-    st.pyplot(fig)
+def build_lead_time(filtered_df, filter_key):
+    centers, counts = bin_counts(filtered_df["lead_time"].to_numpy(), 30)
+    fig = px.bar(x=centers, y=counts, labels={"x": "lead_time", "y": "count"})
+    fig.update_layout(bargap=0)
+    return fig
 
-    st.write("#### Stay Duration (Week + Weekend Nights)")
-    st.write("See how long guests typically stay.")
+def build_stay_duration(filtered_df, filter_key):
     stay_duration = filtered_df['stays_in_week_nights'] + filtered_df['stays_in_weekend_nights']
-    fig, ax = plt.subplots()
-    sns.histplot(stay_duration, bins=20, ax=ax)
-    st.pyplot(fig)
-
-    st.write("#### Customer Type Distribution")
-    st.write("Identify dominant customer profiles.")
-    fig, ax = plt.subplots()
-    sns.countplot(data=filtered_df, x="customer_type", ax=ax)
-    st.pyplot(fig)
-
-    st.write("#### Market Segment Breakdown")
-    st.write("Explore the share of bookings by segment (e.g., online, offline, corporate).")
-    fig, ax = plt.subplots()
-    sns.countplot(data=filtered_df, y="market_segment", order=filtered_df["market_segment"].value_counts().index, ax=ax)
-    st.pyplot(fig)
-
-    st.write("#### Repeat Guest Share")
-    st.write("Gauge loyalty: How many guests are repeat vs new?")
-    repeat_counts = filtered_df['is_repeated_guest'].value_counts()
-    fig, ax = plt.subplots()
-    sns.barplot(x=['New', 'Repeat'], y=repeat_counts.values, ax=ax)
-    st.pyplot(fig)
+    centers, counts = bin_counts(stay_duration.to_numpy(), 20)
+    fig = px.bar(x=centers, y=counts, labels={"x": "stay_duration", "y": "count"})
+    fig.update_layout(bargap=0)
+    return fig
+
+def build_customer_counts(filtered_df, filter_key):
+    customer_counts = filtered_df.groupby("customer_type", observed=True).size().rename("count")
+    return px.bar(customer_counts.reset_index(), x="customer_type", y="count")
+
+def build_segment_counts(filtered_df, filter_key):
+    segment_counts = agg_segment_counts(filter_key)
+    fig = px.bar(segment_counts.reset_index(), x="count", y="market_segment", orientation="h")
+    fig.update_yaxes(autorange="reversed")
+    return fig
+
+def build_repeat_counts(filtered_df, filter_key):
+    repeat_counts = filtered_df['is_repeated_guest'].value_counts().rename(index={0: 'New', 1: 'Repeat'})
+    return px.bar(repeat_counts.reset_index(), x="is_repeated_guest", y="count", labels={"is_repeated_guest": ""})
+
+BOOKING_CHARTS = [
+    ("Lead Time Distribution", "Longer lead times may indicate advanced planning by guests; short lead times can suggest last-minute deals.", build_lead_time),
+    ("Stay Duration (Week + Weekend Nights)", "See how long guests typically stay.", build_stay_duration),
+    ("Customer Type Distribution", "Identify dominant customer profiles.", build_customer_counts),
+    ("Market Segment Breakdown", "Explore the share of bookings by segment (e.g., online, offline, corporate).", build_segment_counts),
+    ("Repeat Guest Share", "Gauge loyalty: How many guests are repeat vs new?", build_repeat_counts),
+]
+
+def render_booking_insights(filtered_df, filter_key):
+    st.header("Booking & Customer Insights")
+
+    render_charts(filtered_df, filter_key, BOOKING_CHARTS)
 
     st.write("#### Room Upgrade Rate")
     st.write("Shows percentage of bookings where assigned room type differs from reserved room type.")
-    upgrade_rate = (filtered_df['assigned_room_type'] != filtered_df['reserved_room_type']).mean() * 100
+    upgraded = filtered_df['assigned_room_type'].cat.codes.to_numpy() != filtered_df['reserved_room_type'].cat.codes.to_numpy()
+    upgrade_rate = upgraded.mean() * 100 if len(upgraded) else float("nan")
     st.metric("Upgrade Rate", f"{upgrade_rate:.2f}%")
 
 # ---- TAB 4: CANCELLATION & REVENUE ----
-with tab4:
+def build_hotel_cancel(filtered_df, filter_key):
+    hotel_cancel = filtered_df.groupby("hotel", observed=True)["is_canceled"].mean()
+    return px.bar(hotel_cancel.reset_index(), x="hotel", y="is_canceled", labels={"is_canceled": "Cancellation Rate"})
+
+def build_month_cancel(filtered_df, filter_key):
+    monthly = agg_monthly(filter_key)
+    return px.line(monthly.reset_index(), x="arrival_date_month", y="cancel_rate", labels={"cancel_rate": "Cancellation Rate"})
+
+def build_revenue_month(filtered_df, filter_key):
+    monthly = agg_monthly(filter_key)
+    return px.bar(monthly.reset_index(), x="arrival_date_month", y="revenue", labels={"revenue": "Total Revenue"})
+
+def build_revenue_segment(filtered_df, filter_key):
+    revenue_segment = agg_revenue_segment(filter_key)
+    fig = px.bar(revenue_segment.reset_index(), x="revenue", y="market_segment", orientation="h", labels={"revenue": "Total Revenue"})
+    fig.update_yaxes(autorange="reversed")
+    return fig
+
+CANCELLATION_REVENUE_CHARTS = [
+    ("Cancellation Rate by Hotel Type", "Visualize which hotels have higher cancellation rates.", build_hotel_cancel),
+    ("Monthly Cancellation Trend", "Spot patterns or peaks in cancellation behavior.", build_month_cancel),
+    ("Revenue by Month", "Understand revenue generation over time.", build_revenue_month),
+    ("Revenue by Market Segment", "Shows which segments are most profitable.", build_revenue_segment),
+]
+
+def render_cancellation_revenue(filtered_df, filter_key):
     st.header("Cancellation & Revenue Analysis")
 
-    st.write("#### Cancellation Rate by Hotel Type")
-    st.write("Visualize which hotels have higher cancellation rates.")
-    fig, ax = plt.subplots()
-    sns.barplot(data=filtered_df, x="hotel", y="is_canceled", ax=ax)
-    ax.set_ylabel("Cancellation Rate")
-    st.pyplot(fig)
-
-    st.write("#### Monthly Cancellation Trend")
-    st.write("Spot patterns or peaks in cancellation behavior.")
-    month_cancel = filtered_df.groupby(['arrival_date_month'])['is_canceled'].mean().reindex(order)
-    fig, ax = plt.subplots()
-    sns.lineplot(x=month_cancel.index, y=month_cancel.values, ax=ax)
-    ax.set_ylabel("Cancellation Rate")
-    plt.xticks(rotation=45)
-    st.pyplot(fig)
-
-    st.write("#### Revenue by Month")
-    st.write("Understand revenue generation over time.")
-    filtered_df["revenue"] = filtered_df["adr"] * (filtered_df["stays_in_week_nights"] + filtered_df["stays_in_weekend_nights"])
-    revenue_month = filtered_df.groupby('arrival_date_month')["revenue"].sum().reindex(order)
-    fig, ax = plt.subplots()
-    sns.barplot(x=revenue_month.index, y=revenue_month.values, ax=ax)
-    ax.set_ylabel("Total Revenue")
-    plt.xticks(rotation=45)
-    st.pyplot(fig)
-
-    st.write("#### Revenue by Market Segment")
-    st.write("Shows which segments are most profitable.")
-    revenue_segment = filtered_df.groupby('market_segment')["revenue"].sum().sort_values(ascending=False)
-    fig, ax = plt.subplots()
-    sns.barplot(y=revenue_segment.index, x=revenue_segment.values, ax=ax)
-    ax.set_xlabel("Total Revenue")
-    st.pyplot(fig)
+    render_charts(filtered_df, filter_key, CANCELLATION_REVENUE_CHARTS)
 
 # ---- TAB 5: SPECIAL REQUESTS & PARKING ----
-with tab5:
+def build_value_counts(col):
+    def build(filtered_df, filter_key):
+        counts = filtered_df[col].value_counts().sort_index()
+        return px.bar(counts.reset_index(), x=col, y="count")
+    return build
+
+def build_kids(filtered_df, filter_key):
+    kids = filtered_df[["children", "babies"]].to_numpy()
+    edges = np.histogram_bin_edges(kids, bins=10)
+    centers, child_counts = bin_counts(kids[:, 0], edges)
+    _, baby_counts = bin_counts(kids[:, 1], edges)
+    kid_counts = pd.DataFrame({"kids per booking": centers, "Children": child_counts, "Babies": baby_counts})
+    fig = px.bar(kid_counts, x="kids per booking", y=["Children", "Babies"], barmode="overlay")
+    fig.update_layout(bargap=0)
+    return fig
+
+def build_top_agents(filtered_df, filter_key):
+    top_agents = agg_top_agents(filter_key)
+    fig = px.bar(top_agents.reset_index().astype({"agent": str}), x="agent", y="count", labels={"agent": "Agent"})
+    fig.update_xaxes(type="category")
+    return fig
+
+def build_status_counts(filtered_df, filter_key):
+    status_counts = filtered_df["reservation_status"].value_counts(sort=False)
+    return px.bar(status_counts.reset_index(), x="reservation_status", y="count")
+
+SPECIAL_REQUEST_CHARTS = [
+    ("Distribution of Special Requests", "Understand how many special requests guests typically make.", build_value_counts("total_of_special_requests")),
+    ("Car Parking Space Requests", "Track demand for parking facilities.", build_value_counts("required_car_parking_spaces")),
+    ("Bookings with Children and Babies", "Explore how many bookings include families with kids.", build_kids),
+    ("Top 10 Agents by Number of Bookings", "See which travel agents drive most bookings.", build_top_agents),
+    ("Bookings by Reservation Status", "Shows share of bookings that are checked out, canceled, or no-show.", build_status_counts),
+]
+
+def render_special_requests(filtered_df, filter_key):
     st.header("Special Requests & Parking Analysis")
 
-    st.write("#### Distribution of Special Requests")
-    st.write("Understand how many special requests guests typically make.")
-    fig, ax = plt.subplots()
-    sns.countplot(data=filtered_df, x="total_of_special_requests", ax=ax)
-    st.pyplot(fig)
-
-    st.write("#### Car Parking Space Requests")
-    st.write("Track demand for parking facilities.")
-    fig, ax = plt.subplots()
-    sns.countplot(data=filtered_df, x="required_car_parking_spaces", ax=ax)
-    st.pyplot(fig)
-
-    st.write("#### Bookings with Children and Babies")
-    st.write("Explore how many bookings include families with kids.")
-    fig, ax = plt.subplots()
-    sns.histplot(filtered_df["children"], bins=10, ax=ax, label='Children')
-    sns.histplot(filtered_df["babies"], bins=10, ax=ax, color='orange', label='Babies')
-    plt.legend()
-    st.pyplot(fig)
-
-    st.write("#### Top 10 Agents by Number of Bookings")
-    st.write("See which travel agents drive most bookings.")
-    top_agents = filtered_df['agent'].value_counts().head(10)
-    fig, ax = plt.subplots()
-    sns.barplot(x=top_agents.index.astype(str), y=top_agents.values, ax=ax)
-    ax.set_xlabel("Agent")
-    st.pyplot(fig)
-
-    st.write("#### Bookings by Reservation Status")
-    st.write("Shows share of bookings that are checked out, canceled, or no-show.")
-    fig, ax = plt.subplots()
-    sns.countplot(data=filtered_df, x="reservation_status", ax=ax)
-    st.pyplot(fig)
+    render_charts(filtered_df, filter_key, SPECIAL_REQUEST_CHARTS)
+
+ALL_CHARTS = OVERVIEW_CHARTS + ADR_CHARTS + BOOKING_CHARTS + CANCELLATION_REVENUE_CHARTS + SPECIAL_REQUEST_CHARTS
+
+def builder_version(build):
+    # Changes whenever the builder's bytecode, constants or closed-over values (e.g. build_adr_box's column) change.
+    # Helpers it calls are not covered: the agg_* caches track their own source, bin_counts/sample_per_group don't,
+    # so clear the cache (or restart) after editing those
+    code = build.__code__
+    consts = tuple(c for c in code.co_consts if not isinstance(c, types.CodeType))
+    cells = tuple(c.cell_contents for c in build.__closure__ or ())
+    return hashlib.sha256(code.co_code + repr((consts, cells)).encode()).hexdigest()
+
+# Room for every chart under each of get_filtered's 32 cached selections
+@st.cache_resource(max_entries=len(ALL_CHARTS) * 32)
+def cached_figure(title, filter_key, version, _build, _filtered_df):
+    # Figures are keyed on chart title, filter key and builder version, and never mutated after building,
+    # so reruns with unchanged selections reuse the same object instead of constructing it again
+    return _build(_filtered_df, filter_key)
+
+TAB_RENDERERS = dict(zip(TAB_NAMES, [
+    render_overview, render_adr_insights, render_booking_insights, render_cancellation_revenue, render_special_requests
+]))
+TAB_RENDERERS[active_tab](filtered_df, filter_key)
 
 # ---- END ----
 st.sidebar.markdown("---")